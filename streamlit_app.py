@@ -8,17 +8,134 @@ from plotly.subplots import make_subplots
 import folium
 from streamlit_folium import st_folium
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
+import heapq
+from operator import itemgetter
+import orjson
+import hashlib
 import math
-from geopy.distance import geodesic
 import warnings
 from folium import plugins
 import feedparser
 import re
-from bs4 import BeautifulSoup
+import html
 warnings.filterwarnings('ignore')
 
+# Major coastal cities used for tsunami arrival estimates
+CITY_NAMES = [
+    'Honolulu, HI',
+    'Los Angeles, CA',
+    'San Francisco, CA',
+    'Seattle, WA',
+    'Tokyo, Japan',
+    'Manila, Philippines',
+    'Sydney, Australia',
+    'Vladivostok, Russia'
+]
+CITY_COORDS = np.array([
+    [21.3099, -157.8581],
+    [34.0522, -118.2437],
+    [37.7749, -122.4194],
+    [47.6062, -122.3321],
+    [35.6762, 139.6503],
+    [14.5995, 120.9842],
+    [-33.8688, 151.2093],
+    [43.1056, 131.8735]
+], dtype=np.float64)
+EARTH_RADIUS_KM = 6371.0
+
+# Tsunami threat levels, most to least severe; threat codes index into this array
+THREAT_LEVELS = np.array(["EXTREME", "HIGH", "MEDIUM", "LOW", "MINIMAL"])
+
+# News keyword matching, compiled once into single-pass patterns
+EARTHQUAKE_KEYWORDS = ['earthquake', 'tsunami', 'seismic', 'tremor', 'quake', 'aftershock', 'magnitude', 'richter', 'epicenter']
+HIGH_PRIORITY_KEYWORDS = ['tsunami', 'earthquake', 'magnitude 7', 'magnitude 8', 'magnitude 9', 'warning', 'alert']
+MEDIUM_PRIORITY_KEYWORDS = ['seismic', 'tremor', 'aftershock', 'epicenter', 'richter', 'fault']
+EARTHQUAKE_KEYWORD_RE = re.compile('|'.join(map(re.escape, EARTHQUAKE_KEYWORDS)), re.IGNORECASE)
+RELEVANCE_KEYWORD_RE = re.compile(
+    '|'.join(map(re.escape, HIGH_PRIORITY_KEYWORDS + MEDIUM_PRIORITY_KEYWORDS)), re.IGNORECASE
+)
+HIGH_PRIORITY_SET = frozenset(HIGH_PRIORITY_KEYWORDS)
+NO_PUBLISH_TIME = (0,) * 9  # Sort fallback for articles without a parsed date
+# Same identification feedparser sends when it downloads a feed itself
+FEED_REQUEST_HEADERS = {
+    'User-Agent': feedparser.USER_AGENT,
+    'Accept': 'application/atom+xml,application/rdf+xml,application/rss+xml,application/xml;q=0.9,text/xml;q=0.2,*/*;q=0.1'
+}
+
+# Source preference when the same story appears in several feeds (higher wins)
+SOURCE_REPUTATION = {
+    'Reuters': 10,
+    'AP News': 10,
+    'USGS News': 10,
+    'NOAA News': 10,
+    'Earthquake Alert': 9,
+    'BBC': 9,
+    'CNN': 7
+}
+NON_WORD_RE = re.compile(r'\W+')
+
+# News card accent colors per source, with RGB components for translucent badges
+SOURCE_COLORS = {
+    'Reuters': '#FF6B35',
+    'BBC': '#BB1919',
+    'CNN': '#CC0000',
+    'AP News': '#0077C8',
+    'USGS News': '#006633',
+    'NOAA News': '#003366',
+    'Earthquake Alert': '#8B0000'
+}
+SOURCE_RGB = {
+    source: (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+    for source, color in SOURCE_COLORS.items()
+}
+
+# Time windows used to slice the earthquake feed
+TIME_WINDOWS = {
+    "Last 24 hours": timedelta(hours=24),
+    "Last 48 hours": timedelta(hours=48),
+    "Last 7 days": timedelta(days=7),
+    "Last 30 days": timedelta(days=30)
+}
+
+# Earthquake marker styling by magnitude bucket: <5, 5-6, 6-7, 7-8, >=8
+MAGNITUDE_BINS = np.array([5.0, 6.0, 7.0, 8.0])
+MARKER_COLORS = np.array(['#32CD32', '#FFD700', '#FF8C00', '#FF0000', '#8B0000'])  # Green, gold, orange, red, dark red
+MARKER_RADII = np.array([5, 10, 15, 20, 25])
+MARKER_ICONS = np.array(['record', 'info-sign', 'warning-sign', 'exclamation-sign', 'exclamation-triangle'])
+
+# Earthquake marker popup; filled with %-formatting for the whole marker set at once
+MARKER_POPUP_TEMPLATE = """
+<div style="width: 300px;">
+    <h4 style="color: %s;">📍 Magnitude %.1f Earthquake</h4>
+    <hr>
+    <b>🕐 Time:</b> %s<br>
+    <b>📍 Location:</b> %s<br>
+    <b>🌊 Depth:</b> %.1f km<br>
+    <b>⚠️ Tsunami Risk:</b> %s<br>
+    <b>🔗 Details:</b> <a href="%s" target="_blank">USGS Report</a>
+    <hr>
+    <small>Age: %.1f hours ago</small>
+</div>
+"""
+
+# Tectonic plate boundaries (simplified), as [lat, lon] vertices
+PLATE_BOUNDARY_SEGMENTS = [
+    # Pacific Ring of Fire (simplified)
+    [[60, -180], [60, -120], [40, -120], [35, -125], [32, -115], [25, -110]],
+    [[25, -110], [15, -95], [10, -85], [-10, -80], [-30, -70], [-40, -75]],
+    # Japan Trench
+    [[45, 145], [40, 142], [35, 140], [30, 138], [25, 135]],
+    # Kamchatka-Aleutian
+    [[65, 170], [60, 165], [55, 160], [52, 158], [50, 155]]
+]
+
+# HTML stripping for feed summaries
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
 # Page config
 st.set_page_config(
     page_title="🌊 Global Tsunami Warning & Simulation System",
@@ -85,13 +202,24 @@ st.markdown("""
 
 # Initialize session state
 if 'last_update' not in st.session_state:
-    st.session_state.last_update = datetime.now()
+    st.session_state.last_update = datetime.now()  # Wall-clock time, for display only
+if 'last_update_mono' not in st.session_state:
+    st.session_state.last_update_mono = time.monotonic()  # Drives the auto-refresh timer
 if 'earthquake_data' not in st.session_state:
     st.session_state.earthquake_data = pd.DataFrame()
 if 'tsunami_alerts' not in st.session_state:
     st.session_state.tsunami_alerts = []
 if 'news_data' not in st.session_state:
     st.session_state.news_data = []
+if 'news_source_names' not in st.session_state:
+    st.session_state.news_source_names = []
+if 'news_relevance' not in st.session_state:
+    st.session_state.news_relevance = np.array([], dtype=np.int64)
+if 'advanced_map' not in st.session_state:
+    st.session_state.advanced_map = (None, 0.0, None)  # (payload hashes, build time, folium.Map)
+
+# Reference time for this rerun, shared by every time-window filter below
+now = datetime.now()
 
 # Sidebar
 st.sidebar.title("🔧 Control Panel")
@@ -103,7 +231,8 @@ refresh_interval = st.sidebar.slider("Refresh interval (seconds)", 30, 300, 60)
 
 # Manual refresh button
 if st.sidebar.button("🔄 Refresh Now"):
-    st.session_state.last_update = datetime.now()
+    st.session_state.last_update = now
+    st.session_state.last_update_mono = time.monotonic()
     st.rerun()
 
 # Data source selection
@@ -129,16 +258,32 @@ depth_threshold = st.sidebar.slider("Maximum Depth (km)", 10, 700, 100)
 tsunami_threshold = st.sidebar.slider("Tsunami Warning Magnitude", 6.0, 9.0, 7.0, 0.1)
 
 # Functions for data fetching
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so repeated USGS/feed requests reuse pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=3)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def dataframe_fingerprint(df):
+    """Cheap content hash of a DataFrame, used as a cache key"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=8).hexdigest()
+
 @st.cache_data(ttl=60)
 def fetch_usgs_data():
     """Fetch earthquake data from USGS"""
     try:
         # Get earthquakes from last 24 hours
         url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_day.geojson"
-        response = requests.get(url, timeout=10)
+        response = get_http_session().get(url, timeout=10)
         if response.status_code == 200:
-            data = response.json()
-            earthquakes = []
+            data = orjson.loads(response.content)
+            # Collect columns directly instead of building a dict per earthquake
+            times, lats, lons, depths, mags = [], [], [], [], []
+            places, alerts, tsunamis, urls, ids = [], [], [], [], []
             
             for feature in data['features']:
                 props = feature['properties']
@@ -151,62 +296,73 @@ def fetch_usgs_data():
                 # Skip invalid entries
                 if magnitude is None or magnitude < 0:
                     continue
-                if depth is None:
-                    depth = 0
                 
-                earthquake = {
-                    'time': pd.to_datetime(props['time'], unit='ms'),
-                    'latitude': coords[1],
-                    'longitude': coords[0],
-                    'depth': max(0, depth),  # Ensure depth is non-negative
-                    'magnitude': max(0.1, magnitude),  # Ensure magnitude is positive
-                    'place': props.get('place', 'Unknown location'),
-                    'alert': props.get('alert', 'green'),
-                    'tsunami': props.get('tsunami', 0),
-                    'url': props.get('url', ''),
-                    'id': feature['id']
-                }
-                earthquakes.append(earthquake)
+                times.append(props['time'])
+                lats.append(coords[1])
+                lons.append(coords[0])
+                depths.append(0 if depth is None else depth)
+                mags.append(magnitude)
+                places.append(props.get('place') or 'Unknown location')
+                alerts.append(props.get('alert', 'green'))
+                tsunamis.append(props.get('tsunami', 0))
+                urls.append(props.get('url') or '')
+                ids.append(feature['id'])
             
-            df = pd.DataFrame(earthquakes)
+            df = pd.DataFrame({
+                'time': pd.to_datetime(times, unit='ms'),
+                'latitude': np.asarray(lats, dtype=np.float64),
+                'longitude': np.asarray(lons, dtype=np.float64),
+                'depth': np.clip(np.asarray(depths, dtype=np.float64), 0, None),  # Ensure depth is non-negative
+                'magnitude': np.clip(np.asarray(mags, dtype=np.float64), 0.1, None),  # Ensure magnitude is positive
+                # Arrow-backed strings are compact and cheap to copy/serialize in session state
+                'place': pd.array(places, dtype='string[pyarrow]'),
+                'alert': pd.array(alerts, dtype='string[pyarrow]'),
+                'tsunami': tsunamis,
+                'url': pd.array(urls, dtype='string[pyarrow]'),
+                'id': pd.array(ids, dtype='string[pyarrow]')
+            })
             # Additional data cleaning
             if not df.empty:
                 df = df.dropna(subset=['magnitude', 'latitude', 'longitude'])
                 df = df[df['magnitude'] > 0]  # Remove any remaining invalid magnitudes
+                # Newest first, so every "last N hours" window is a prefix of the frame
+                df = df.sort_values('time', ascending=False).reset_index(drop=True)
             
             return df
     except Exception as e:
         st.error(f"Error fetching USGS data: {str(e)}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
-def fetch_noaa_tsunami_data():
+@st.cache_data(ttl=60, hash_funcs={pd.DataFrame: dataframe_fingerprint})
+def fetch_noaa_tsunami_data(earthquake_data, tsunami_threshold, depth_threshold):
     """Fetch tsunami alert data from NOAA"""
     try:
         # NOAA doesn't have a direct public API, so we'll simulate based on earthquake data
         # In a real implementation, you'd integrate with official tsunami warning systems
         alerts = []
-        if not st.session_state.earthquake_data.empty:
-            recent_large = st.session_state.earthquake_data[
-                (st.session_state.earthquake_data['magnitude'] >= tsunami_threshold) &
-                (st.session_state.earthquake_data['depth'] <= depth_threshold) &
-                (st.session_state.earthquake_data['time'] >= datetime.now() - timedelta(hours=24))
+        if not earthquake_data.empty:
+            recent_large = earthquake_data[
+                (earthquake_data['magnitude'] >= tsunami_threshold) &
+                (earthquake_data['depth'] <= depth_threshold) &
+                (earthquake_data['time'] >= datetime.now() - timedelta(hours=24))
             ]
             
-            for _, eq in recent_large.iterrows():
-                # Calculate tsunami threat level
-                threat_level = calculate_tsunami_threat(eq['magnitude'], eq['depth'])
-                
+            # Calculate tsunami threat levels for all qualifying earthquakes at once
+            threat_levels = calculate_tsunami_threat_levels(
+                recent_large['magnitude'].to_numpy(), recent_large['depth'].to_numpy()
+            ).tolist()
+            
+            for eq, threat_level in zip(recent_large.itertuples(index=False), threat_levels):
                 alert = {
-                    'id': f"tsunami_{eq['id']}",
-                    'earthquake_id': eq['id'],
+                    'id': f"tsunami_{eq.id}",
+                    'earthquake_id': eq.id,
                     'threat_level': threat_level,
-                    'magnitude': eq['magnitude'],
-                    'location': eq['place'],
-                    'latitude': eq['latitude'],
-                    'longitude': eq['longitude'],
-                    'time': eq['time'],
-                    'estimated_arrival': calculate_tsunami_arrival_times(eq['latitude'], eq['longitude'])
+                    'magnitude': eq.magnitude,
+                    'location': eq.place,
+                    'latitude': eq.latitude,
+                    'longitude': eq.longitude,
+                    'time': eq.time,
+                    'estimated_arrival': calculate_tsunami_arrival_times(eq.latitude, eq.longitude)
                 }
                 alerts.append(alert)
         
@@ -215,40 +371,38 @@ def fetch_noaa_tsunami_data():
         st.error(f"Error processing tsunami data: {str(e)}")
         return []
 
-def calculate_tsunami_threat(magnitude, depth):
-    """Calculate tsunami threat level based on earthquake parameters"""
-    if magnitude >= 8.5 and depth <= 50:
-        return "EXTREME"
-    elif magnitude >= 8.0 and depth <= 70:
-        return "HIGH"
-    elif magnitude >= 7.5 and depth <= 100:
-        return "MEDIUM"
-    elif magnitude >= 7.0 and depth <= 150:
-        return "LOW"
-    else:
-        return "MINIMAL"
+def calculate_tsunami_threat_codes(magnitude, depth):
+    """Calculate tsunami threat codes (indices into THREAT_LEVELS) from magnitude and depth arrays"""
+    conditions = [
+        (magnitude >= 8.5) & (depth <= 50),
+        (magnitude >= 8.0) & (depth <= 70),
+        (magnitude >= 7.5) & (depth <= 100),
+        (magnitude >= 7.0) & (depth <= 150)
+    ]
+    return np.select(conditions, [0, 1, 2, 3], default=4)
+
+def calculate_tsunami_threat_levels(magnitude, depth):
+    """Calculate tsunami threat levels from arrays of earthquake magnitudes and depths"""
+    return THREAT_LEVELS[calculate_tsunami_threat_codes(magnitude, depth)]
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km from a point to an array of points"""
+    lat1, lon1 = np.radians(lat1), np.radians(lon1)
+    lat2, lon2 = np.radians(lat2), np.radians(lon2)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
 
 def calculate_tsunami_arrival_times(eq_lat, eq_lon):
     """Calculate estimated tsunami arrival times for major coastal cities"""
-    # Major coastal cities coordinates
-    cities = {
-        'Honolulu, HI': (21.3099, -157.8581),
-        'Los Angeles, CA': (34.0522, -118.2437),
-        'San Francisco, CA': (37.7749, -122.4194),
-        'Seattle, WA': (47.6062, -122.3321),
-        'Tokyo, Japan': (35.6762, 139.6503),
-        'Manila, Philippines': (14.5995, 120.9842),
-        'Sydney, Australia': (-33.8688, 151.2093),
-        'Vladivostok, Russia': (43.1056, 131.8735)
-    }
+    distances = haversine_km(eq_lat, eq_lon, CITY_COORDS[:, 0], CITY_COORDS[:, 1])
     
     arrival_times = {}
     tsunami_speed = 800  # km/h average speed in deep ocean
+    now = datetime.now()
     
-    for city, (lat, lon) in cities.items():
-        distance = geodesic((eq_lat, eq_lon), (lat, lon)).kilometers
+    for city, distance in zip(CITY_NAMES, distances.tolist()):
         travel_time_hours = distance / tsunami_speed
-        arrival_time = datetime.now() + timedelta(hours=travel_time_hours)
+        arrival_time = now + timedelta(hours=travel_time_hours)
         arrival_times[city] = {
             'distance_km': distance,
             'travel_time_hours': travel_time_hours,
@@ -258,37 +412,63 @@ def calculate_tsunami_arrival_times(eq_lat, eq_lon):
     return arrival_times
 
 def simulate_wave_propagation(eq_lat, eq_lon, magnitude, hours_ahead=6):
-    """Simulate tsunami wave propagation"""
+    """Simulate tsunami wave propagation, returning per-hour arrays of the grid points reached"""
     # Create a grid for wave simulation
-    lat_range = np.linspace(eq_lat - 20, eq_lat + 20, 50)
-    lon_range = np.linspace(eq_lon - 30, eq_lon + 30, 50)
+    lat_range = np.linspace(eq_lat - 20, eq_lat + 20, 50)[::5]  # Sample every 5th point for performance
+    lon_range = np.linspace(eq_lon - 30, eq_lon + 30, 50)[::5]
+    grid_lat, grid_lon = np.meshgrid(lat_range, lon_range, indexing='ij')
+    grid_lat = grid_lat.ravel()
+    grid_lon = grid_lon.ravel()
     
-    simulation_data = []
     tsunami_speed = 800  # km/h
     
-    for hour in range(hours_ahead + 1):
-        for lat in lat_range[::5]:  # Sample every 5th point for performance
-            for lon in lon_range[::5]:
-                distance = geodesic((eq_lat, eq_lon), (lat, lon)).kilometers
-                travel_time = distance / tsunami_speed
-                
-                if travel_time <= hour:
-                    # Calculate wave height based on magnitude and distance
-                    wave_height = max(0, (magnitude - 6) * np.exp(-distance / 2000))
-                    if wave_height > 0.1:  # Only include significant waves
-                        simulation_data.append({
-                            'hour': hour,
-                            'latitude': lat,
-                            'longitude': lon,
-                            'wave_height': wave_height,
-                            'distance': distance
-                        })
+    # Distance from the epicenter to every grid point, computed once
+    distance = haversine_km(eq_lat, eq_lon, grid_lat, grid_lon)
+    travel_time = distance / tsunami_speed
     
-    return pd.DataFrame(simulation_data)
+    # Wave height based on magnitude and distance; only significant waves are kept
+    wave_height = np.maximum(0, (magnitude - 6) * np.exp(-distance / 2000))
+    significant = wave_height > 0.1
+    
+    # Order the significant points by arrival time once; the points reached by each hour
+    # are then a prefix of that ordering, so every hour is a zero-copy slice
+    order = np.flatnonzero(significant)
+    order = order[np.argsort(travel_time[order], kind='stable')]
+    grid_lat, grid_lon = grid_lat[order], grid_lon[order]
+    wave_height, distance = wave_height[order], distance[order]
+    hour_ends = np.searchsorted(travel_time[order], np.arange(hours_ahead + 1), side='right')
+    
+    return {
+        hour: {
+            'latitude': grid_lat[:end],
+            'longitude': grid_lon[:end],
+            'wave_height': wave_height[:end],
+            'distance': distance[:end]
+        }
+        for hour, end in enumerate(hour_ends.tolist())
+    }
 
 # News fetching functions
+def fetch_feed_content(session, url):
+    """Download a single RSS/Atom feed and return the HTTP response"""
+    response = session.get(url, headers=FEED_REQUEST_HEADERS, timeout=10)
+    response.raise_for_status()
+    return response
+
+def fetch_and_parse_feed(session, url):
+    """Download and parse a single feed; runs on a worker thread"""
+    try:
+        response = fetch_feed_content(session, url)
+    except requests.RequestException as e:
+        # Unreachable or non-2xx feeds count as empty, as feedparser.parse(url) treated them
+        return feedparser.FeedParserDict(entries=[], bozo=True, bozo_exception=e)
+    # Pass the headers along so feedparser still sees Content-Type charset and Content-Location;
+    # feedparser looks them up by lower-case name
+    response_headers = {key.lower(): value for key, value in response.headers.items()}
+    return feedparser.parse(response.content, response_headers=response_headers)
+
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def fetch_news_feeds():
+def fetch_news_feeds(selected_sources):
     """Fetch news from multiple sources"""
     news_feeds = {
         "Reuters": "http://feeds.reuters.com/reuters/topNews",
@@ -299,64 +479,132 @@ def fetch_news_feeds():
         "NOAA News": "https://www.noaa.gov/rss/all-news-rss-feed.xml",
         "Earthquake Alert": "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/significant_month.atom"
     }
+    selected_feeds = {source: url for source, url in news_feeds.items() if source in selected_sources}
     
     all_news = []
-    earthquake_keywords = ['earthquake', 'tsunami', 'seismic', 'tremor', 'quake', 'aftershock', 'magnitude', 'richter', 'epicenter']
     
-    for source, url in news_feeds.items():
-        if source in news_sources:
-            try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:10]:  # Get latest 10 articles per source
-                    # Check if article is earthquake/tsunami related
-                    title_lower = entry.title.lower()
-                    summary_lower = entry.get('summary', '').lower()
-                    
-                    is_relevant = any(keyword in title_lower or keyword in summary_lower 
-                                    for keyword in earthquake_keywords)
+    # Resolve the shared session on the script thread; cache_resource getters need its ScriptRunContext
+    session = get_http_session()
+    
+    # Download and parse all feeds concurrently so the total wait is the slowest feed, not the sum
+    with ThreadPoolExecutor(max_workers=max(1, len(selected_feeds))) as executor:
+        parsed_feeds = {source: executor.submit(fetch_and_parse_feed, session, url) for source, url in selected_feeds.items()}
+    
+    for source, parsed_feed in parsed_feeds.items():
+        try:
+            feed = parsed_feed.result()
+            for entry in feed.entries[:10]:  # Get latest 10 articles per source
+                # Check if article is earthquake/tsunami related
+                is_relevant = bool(EARTHQUAKE_KEYWORD_RE.search(entry.title) or
+                                   EARTHQUAKE_KEYWORD_RE.search(entry.get('summary', '')))
+                
+                if is_relevant or source in ['USGS News', 'Earthquake Alert']:
+                    # Clean HTML from summary
+                    summary = entry.get('summary', entry.get('description', ''))
+                    if summary:
+                        summary = html.unescape(WHITESPACE_RE.sub(' ', HTML_TAG_RE.sub('', summary))).strip()
                     
-                    if is_relevant or source in ['USGS News', 'Earthquake Alert']:
-                        # Clean HTML from summary
-                        summary = entry.get('summary', entry.get('description', ''))
-                        if summary:
-                            soup = BeautifulSoup(summary, 'html.parser')
-                            summary = soup.get_text()
-                        
-                        news_item = {
-                            'source': source,
-                            'title': entry.title,
-                            'summary': summary[:300] + "..." if len(summary) > 300 else summary,
-                            'link': entry.link,
-                            'published': entry.get('published', 'No date'),
-                            'published_parsed': entry.get('published_parsed'),
-                            'relevance_score': calculate_relevance_score(entry.title, summary)
-                        }
-                        all_news.append(news_item)
-            except Exception as e:
-                st.warning(f"Could not fetch news from {source}: {str(e)}")
+                    published_parsed = entry.get('published_parsed')
+                    news_item = {
+                        'source': source,
+                        'title': entry.title,
+                        'summary': summary[:300] + "..." if len(summary) > 300 else summary,
+                        'link': entry.link,
+                        'published': entry.get('published', 'No date'),
+                        'published_parsed': published_parsed,
+                        'published_dt': datetime(*published_parsed[:6]) if published_parsed else None,
+                        'relevance_score': calculate_relevance_score(entry.title, summary)
+                    }
+                    all_news.append(news_item)
+        except Exception as e:
+            st.warning(f"Could not fetch news from {source}: {str(e)}")
+    
+    # Keep one copy of stories carried by several feeds, preferring the more reputable source
+    unique_news = {}
+    for news in all_news:
+        key = news_dedup_key(news)
+        kept = unique_news.get(key)
+        if kept is None or SOURCE_REPUTATION.get(news['source'], 0) > SOURCE_REPUTATION.get(kept['source'], 0):
+            unique_news[key] = news
     
-    # Sort by relevance and date
-    all_news.sort(key=lambda x: (x['relevance_score'], x['published_parsed'] or (0,) * 9), reverse=True)
-    return all_news[:50]  # Return top 50 most relevant articles
+    # Top 50 most relevant articles, newest first among equal scores
+    return heapq.nlargest(50, unique_news.values(), key=lambda x: (x['relevance_score'], x['published_parsed'] or NO_PUBLISH_TIME))
+
+def news_dedup_key(news):
+    """Identify a story across feeds by its normalized title prefix and publish date"""
+    title = NON_WORD_RE.sub(' ', news['title']).lower().strip()[:50]
+    day = news['published_dt'].strftime('%Y%m%d') if news['published_dt'] else ''
+    return title, day
+
+def render_news_card(source, title, summary, link, published, relevance_score, color, rgb):
+    """Render the HTML card for a single news article"""
+    r, g, b = rgb
+    return f"""<div style="
+    border-left: 5px solid {color}; 
+    padding: 15px; 
+    margin: 10px 0; 
+    background-color: rgba(255, 255, 255, 0.05);
+    border-radius: 5px;
+">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+        <span style="background-color: {color}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px; font-weight: bold;">
+            {source}
+        </span>
+        <small style="color: #888;">{published}</small>
+    </div>
+    <h4 style="margin: 8px 0; color: {color};">
+        <a href="{link}" target="_blank" style="text-decoration: none; color: inherit;">
+            {title}
+        </a>
+    </h4>
+    <p style="margin: 8px 0; line-height: 1.5; color: #ddd;">
+        {summary}
+    </p>
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 10px;">
+        <span style="background-color: rgba({r}, {g}, {b}, 0.2); 
+                     color: {color}; padding: 2px 6px; border-radius: 8px; font-size: 11px;">
+            Relevance: {relevance_score}
+        </span>
+        <a href="{link}" target="_blank" style="
+            background-color: {color}; 
+            color: white; 
+            padding: 5px 12px; 
+            border: none; 
+            border-radius: 15px; 
+            text-decoration: none; 
+            font-size: 12px;
+            font-weight: bold;
+        ">
+            Read Full Article →
+        </a>
+    </div>
+</div>"""
 
 def calculate_relevance_score(title, summary):
     """Calculate relevance score for earthquake/tsunami news"""
-    high_priority_keywords = ['tsunami', 'earthquake', 'magnitude 7', 'magnitude 8', 'magnitude 9', 'warning', 'alert']
-    medium_priority_keywords = ['seismic', 'tremor', 'aftershock', 'epicenter', 'richter', 'fault']
-    
-    text = (title + " " + summary).lower()
-    score = 0
-    
-    for keyword in high_priority_keywords:
-        score += text.count(keyword) * 3
-    
-    for keyword in medium_priority_keywords:
-        score += text.count(keyword) * 1
-    
-    return score
+    text = title + " " + summary
+    # High priority keywords score 3, medium priority keywords score 1
+    return sum(3 if match.group().lower() in HIGH_PRIORITY_SET else 1
+               for match in RELEVANCE_KEYWORD_RE.finditer(text))
+
+@st.cache_resource
+def plate_boundaries_geojson():
+    """Serialize the static plate boundaries to a GeoJSON string once per process"""
+    features = [
+        {
+            'type': 'Feature',
+            'properties': {},
+            'geometry': {'type': 'LineString', 'coordinates': [[lon, lat] for lat, lon in segment]}
+        }
+        for segment in PLATE_BOUNDARY_SEGMENTS
+    ]
+    return orjson.dumps({'type': 'FeatureCollection', 'features': features}).decode()
+
+def create_advanced_map(earthquake_data, recent_eq, tsunami_alerts):
+    """Create an advanced interactive map with multiple layers
 
-def create_advanced_map(earthquake_data, tsunami_alerts):
-    """Create an advanced interactive map with multiple layers"""
+    recent_eq is the subset of earthquake_data from the last 24 hours that gets individual markers.
+    """
     if earthquake_data.empty:
         # Default center if no data
         center_lat, center_lon = 35.0, 139.0
@@ -394,55 +642,40 @@ def create_advanced_map(earthquake_data, tsunami_alerts):
     plate_boundaries = folium.FeatureGroup(name='Tectonic Plates')
     
     # Add earthquake markers with advanced styling
-    if not earthquake_data.empty:
-        recent_eq = earthquake_data[earthquake_data['time'] >= datetime.now() - timedelta(hours=24)]
+    if not recent_eq.empty:
+        now = datetime.now()
         
-        for _, eq in recent_eq.iterrows():
-            # Dynamic color and size based on magnitude and time
-            age_hours = (datetime.now() - eq['time']).total_seconds() / 3600
-            
-            if eq['magnitude'] >= 8.0:
-                color = '#8B0000'  # Dark red
-                radius = 25
-                icon = 'exclamation-triangle'
-            elif eq['magnitude'] >= 7.0:
-                color = '#FF0000'  # Red
-                radius = 20
-                icon = 'exclamation-sign'
-            elif eq['magnitude'] >= 6.0:
-                color = '#FF8C00'  # Orange
-                radius = 15
-                icon = 'warning-sign'
-            elif eq['magnitude'] >= 5.0:
-                color = '#FFD700'  # Gold
-                radius = 10
-                icon = 'info-sign'
-            else:
-                color = '#32CD32'  # Green
-                radius = 5
-                icon = 'record'
-            
-            # Fade older earthquakes
-            opacity = max(0.3, 1 - (age_hours / 24))
-            
-            # Create detailed popup
-            popup_html = f"""
-            <div style="width: 300px;">
-                <h4 style="color: {color};">📍 Magnitude {eq['magnitude']:.1f} Earthquake</h4>
-                <hr>
-                <b>🕐 Time:</b> {eq['time'].strftime('%Y-%m-%d %H:%M:%S UTC')}<br>
-                <b>📍 Location:</b> {eq['place']}<br>
-                <b>🌊 Depth:</b> {eq['depth']:.1f} km<br>
-                <b>⚠️ Tsunami Risk:</b> {'HIGH' if eq['magnitude'] >= 7.0 and eq['depth'] <= 100 else 'LOW'}<br>
-                <b>🔗 Details:</b> <a href="{eq.get('url', '#')}" target="_blank">USGS Report</a>
-                <hr>
-                <small>Age: {age_hours:.1f} hours ago</small>
-            </div>
-            """
-            
+        # Dynamic color and size based on magnitude and time, computed for all rows at once
+        magnitudes = recent_eq['magnitude'].to_numpy()
+        depths = recent_eq['depth'].to_numpy()
+        bucket = np.searchsorted(MAGNITUDE_BINS, magnitudes, side='right')
+        colors = MARKER_COLORS[bucket].tolist()
+        radii = MARKER_RADII[bucket].tolist()
+        icons = MARKER_ICONS[bucket].tolist()
+        ages = (np.datetime64(now) - recent_eq['time'].to_numpy()) / np.timedelta64(1, 'h')
+        # Fade older earthquakes
+        opacities = np.maximum(0.3, 1 - ages / 24).tolist()
+        
+        # Create detailed popups
+        tsunami_risks = np.where((magnitudes >= 7.0) & (depths <= 100), 'HIGH', 'LOW')
+        time_strs = recent_eq['time'].dt.strftime('%Y-%m-%d %H:%M:%S UTC')
+        popups = [
+            MARKER_POPUP_TEMPLATE % fields
+            for fields in zip(colors, magnitudes, time_strs, recent_eq['place'], depths,
+                              tsunami_risks, recent_eq['url'], ages)
+        ]
+        
+        # Cluster the many small (M<5) quakes; larger events keep individual markers
+        low_magnitude_cluster = plugins.MarkerCluster(
+            options={'maxClusterRadius': 60, 'disableClusteringAtZoom': 6}
+        ).add_to(earthquake_layer)
+        
+        for eq, bucket_idx, color, radius, icon, opacity, age_hours, popup_html in zip(
+            recent_eq.itertuples(index=False), bucket.tolist(), colors, radii, icons, opacities, ages.tolist(), popups
+        ):
             # Add circle marker
             folium.CircleMarker(
-                location=[eq['latitude'], eq['longitude']],
+                location=[eq.latitude, eq.longitude],
                 radius=radius,
                 popup=folium.Popup(popup_html, max_width=320),
                 color='white',
@@ -450,10 +683,10 @@ def create_advanced_map(earthquake_data, tsunami_alerts):
                 fillColor=color,
                 fillOpacity=opacity,
                 opacity=opacity
-            ).add_to(earthquake_layer)
+            ).add_to(earthquake_layer if bucket_idx > 0 else low_magnitude_cluster)
             
             # Add pulsing effect for recent large earthquakes
-            if eq['magnitude'] >= 7.0 and age_hours < 6:
+            if eq.magnitude >= 7.0 and age_hours < 6:
                 folium.plugins.BeautifyIcon(
                     icon=icon,
                     border_color=color,
@@ -488,24 +721,11 @@ def create_advanced_map(earthquake_data, tsunami_alerts):
             ).add_to(tsunami_layer)
     
     # Add tectonic plate boundaries (simplified)
-    plate_boundary_coords = [
-        # Pacific Ring of Fire (simplified)
-        [[60, -180], [60, -120], [40, -120], [35, -125], [32, -115], [25, -110]],
-        [[25, -110], [15, -95], [10, -85], [-10, -80], [-30, -70], [-40, -75]],
-        # Japan Trench
-        [[45, 145], [40, 142], [35, 140], [30, 138], [25, 135]],
-        # Kamchatka-Aleutian
-        [[65, 170], [60, 165], [55, 160], [52, 158], [50, 155]]
-    ]
-    
-    for coords in plate_boundary_coords:
-        folium.PolyLine(
-            coords,
-            color='red',
-            weight=2,
-            opacity=0.6,
-            popup="Tectonic Plate Boundary"
-        ).add_to(plate_boundaries)
+    folium.GeoJson(
+        plate_boundaries_geojson(),
+        style_function=lambda feature: {'color': 'red', 'weight': 2, 'opacity': 0.6},
+        tooltip="Tectonic Plate Boundary"
+    ).add_to(plate_boundaries)
     
     # Add all layers to map
     earthquake_layer.add_to(m)
@@ -514,8 +734,7 @@ def create_advanced_map(earthquake_data, tsunami_alerts):
     
     # Add heat map for earthquake density
     if not earthquake_data.empty:
-        heat_data = [[row['latitude'], row['longitude'], row['magnitude']] 
-                    for _, row in earthquake_data.iterrows()]
+        heat_data = earthquake_data[['latitude', 'longitude', 'magnitude']].to_numpy().tolist()
         plugins.HeatMap(heat_data, radius=15, blur=10, gradient={
             0.2: 'blue', 0.4: 'lime', 0.6: 'orange', 1: 'red'
         }).add_to(folium.FeatureGroup(name='Earthquake Heatmap').add_to(m))
@@ -534,9 +753,25 @@ def create_advanced_map(earthquake_data, tsunami_alerts):
     
     return m
 
+def build_advanced_map(map_key, earthquake_data, recent_eq, tsunami_alerts):
+    """Build the advanced map once per session for each distinct earthquake/alert payload"""
+    # Folium maps mutate while rendering, so each session keeps its own instead of sharing one
+    # via st.cache_resource; rebuilding after 60s bounds how stale the marker age fading gets
+    cached_key, built_at, cached_map = st.session_state.advanced_map
+    if cached_key != map_key or time.monotonic() - built_at > 60:
+        cached_map = create_advanced_map(earthquake_data, recent_eq, tsunami_alerts)
+        st.session_state.advanced_map = (map_key, time.monotonic(), cached_map)
+    return cached_map
+
+@st.cache_data(ttl=300, show_spinner=False)
+def dataframe_to_csv(df_hash, _df):
+    """Serialize a DataFrame to CSV bytes once per distinct content hash"""
+    return _df.to_csv(index=False, date_format='%Y-%m-%d %H:%M:%S').encode('utf-8')
+
 # Main data fetching
-if auto_refresh and (datetime.now() - st.session_state.last_update).seconds > refresh_interval:
-    st.session_state.last_update = datetime.now()
+if auto_refresh and time.monotonic() - st.session_state.last_update_mono > refresh_interval:
+    st.session_state.last_update = now
+    st.session_state.last_update_mono = time.monotonic()
     st.rerun()
 
 # Fetch earthquake data
@@ -547,21 +782,38 @@ if use_usgs:
 # Process tsunami alerts
 if use_noaa and not st.session_state.earthquake_data.empty:
     with st.spinner("🌊 Processing tsunami alerts..."):
-        st.session_state.tsunami_alerts = fetch_noaa_tsunami_data()
+        st.session_state.tsunami_alerts = fetch_noaa_tsunami_data(
+            st.session_state.earthquake_data, tsunami_threshold, depth_threshold
+        )
 
 # Fetch news data
 if use_news:
     with st.spinner("📰 Fetching latest news..."):
-        st.session_state.news_data = fetch_news_feeds()
+        st.session_state.news_data = fetch_news_feeds(news_sources)
+        st.session_state.news_source_names = sorted({news['source'] for news in st.session_state.news_data})
+        # Relevance scores in feed order, which is descending
+        st.session_state.news_relevance = np.array(
+            [news['relevance_score'] for news in st.session_state.news_data], dtype=np.int64
+        )
+
+# Time-window slices of the earthquake feed, computed once per rerun and shared by every section.
+# The feed is sorted newest first, so each window is a prefix found by binary search on the negated times.
+if not st.session_state.earthquake_data.empty:
+    negated_times = -st.session_state.earthquake_data['time'].to_numpy().astype('datetime64[ns]').view('i8')
+    st.session_state.earthquake_windows = {
+        window: st.session_state.earthquake_data.iloc[
+            :int(np.searchsorted(negated_times, -pd.Timestamp(now - delta).value, side='right'))
+        ]
+        for window, delta in TIME_WINDOWS.items()
+    }
+    st.session_state.recent_earthquakes = st.session_state.earthquake_windows["Last 24 hours"]
 
 # Main dashboard layout
 col1, col2, col3, col4 = st.columns(4)
 
 # Display key metrics
 if not st.session_state.earthquake_data.empty:
-    recent_eq = st.session_state.earthquake_data[
-        st.session_state.earthquake_data['time'] >= datetime.now() - timedelta(hours=24)
-    ]
+    recent_eq = st.session_state.recent_earthquakes
     
     with col1:
         st.markdown(f'''
@@ -654,7 +906,9 @@ else:
 # Tabs for different views
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["🗺️ Advanced Map", "📰 Live News", "📊 Analytics", "🌊 Simulation", "📋 Recent Events"])
 
-with tab1:
+@st.fragment
+def render_map_tab():
+    """Map tab body; map clicks and map controls rerun only this fragment"""
     st.subheader("🗺️ Advanced Interactive Earthquake & Tsunami Map")
     
     if not st.session_state.earthquake_data.empty:
@@ -669,20 +923,23 @@ with tab1:
         with col4:
             min_mag_map = st.slider("🎚️ Min Magnitude", 0.0, 8.0, 4.0, 0.5)
         
-        # Filter data based on controls
-        time_deltas = {
-            "Last 24 hours": timedelta(hours=24),
-            "Last 7 days": timedelta(days=7),
-            "Last 30 days": timedelta(days=30)
-        }
-        
-        filtered_data = st.session_state.earthquake_data[
-            (st.session_state.earthquake_data['time'] >= datetime.now() - time_deltas[time_filter]) &
-            (st.session_state.earthquake_data['magnitude'] >= min_mag_map)
-        ]
+        # Filter data based on controls, reusing the precomputed time-window slices
+        window_data = st.session_state.earthquake_windows[time_filter]
+        filtered_data = window_data[window_data['magnitude'].to_numpy() >= min_mag_map]
+        # Newest first, so the last-24h markers are a prefix of the filtered frame
+        marker_count = len(st.session_state.recent_earthquakes)
+        marker_data = filtered_data[filtered_data.index < marker_count]
         
-        # Create and display advanced map
-        advanced_map = create_advanced_map(filtered_data, st.session_state.tsunami_alerts)
+        # Create and display advanced map (reused across reruns while the data is unchanged)
+        eq_hash = dataframe_fingerprint(filtered_data)
+        recent_hash = dataframe_fingerprint(marker_data)
+        alerts_hash = hashlib.blake2b(
+            json.dumps(st.session_state.tsunami_alerts, default=str).encode(), digest_size=8
+        ).hexdigest()
+        advanced_map = build_advanced_map(
+            (eq_hash, recent_hash, alerts_hash),
+            filtered_data, marker_data, st.session_state.tsunami_alerts
+        )
         
         # Display map with custom height and prevent auto-reload on interaction
         map_data = st_folium(
@@ -700,12 +957,13 @@ with tab1:
                 # Find closest earthquake to clicked point
                 click_lat, click_lng = clicked_data['lat'], clicked_data['lng']
                 if not filtered_data.empty:
-                    distances = filtered_data.apply(
-                        lambda row: geodesic((click_lat, click_lng), (row['latitude'], row['longitude'])).kilometers,
-                        axis=1
+                    distances = haversine_km(
+                        click_lat, click_lng,
+                        filtered_data['latitude'].to_numpy(),
+                        filtered_data['longitude'].to_numpy()
                     )
-                    closest_idx = distances.idxmin()
-                    closest_eq = filtered_data.loc[closest_idx]
+                    closest_idx = int(distances.argmin())
+                    closest_eq = filtered_data.iloc[closest_idx]
                     
                     if distances[closest_idx] < 100:  # Within 100km
                         with st.container():
@@ -745,6 +1003,9 @@ with tab1:
     else:
         st.info("🔄 Loading earthquake data... Please check your internet connection if this persists.")
 
+with tab1:
+    render_map_tab()
+
 with tab2:
     st.subheader("📰 Breaking News & Updates")
     
@@ -754,8 +1015,8 @@ with tab2:
         with col1:
             selected_sources = st.multiselect(
                 "Filter by Source",
-                options=list(set([news['source'] for news in st.session_state.news_data])),
-                default=list(set([news['source'] for news in st.session_state.news_data]))
+                options=st.session_state.news_source_names,
+                default=st.session_state.news_source_names
             )
         with col2:
             sort_by = st.selectbox("Sort by", ["Relevance", "Date", "Source"])
@@ -763,78 +1024,30 @@ with tab2:
             max_articles = st.slider("Max Articles", 5, 50, 20)
         
         # Filter and sort news
-        filtered_news = [news for news in st.session_state.news_data if news['source'] in selected_sources]
+        selected_set = frozenset(selected_sources)
+        filtered_news = [news for news in st.session_state.news_data if news['source'] in selected_set]
         
         if sort_by == "Date":
-            filtered_news.sort(key=lambda x: x['published_parsed'] or (0,) * 9, reverse=True)
+            # Newest first; articles without a parsed date go last
+            dated_news = [news for news in filtered_news if news['published_dt']]
+            undated_news = [news for news in filtered_news if not news['published_dt']]
+            dated_news.sort(key=itemgetter('published_dt'), reverse=True)
+            filtered_news = dated_news + undated_news
         elif sort_by == "Source":
-            filtered_news.sort(key=lambda x: x['source'])
+            filtered_news.sort(key=itemgetter('source'))
         # Relevance is already sorted
         
         filtered_news = filtered_news[:max_articles]
         
-        # Display news in cards
-        for i, news in enumerate(filtered_news):
-            with st.container():
-                # Color coding by source
-                source_colors = {
-                    'Reuters': '#FF6B35',
-                    'BBC': '#BB1919',
-                    'CNN': '#CC0000',
-                    'AP News': '#0077C8',
-                    'USGS News': '#006633',
-                    'NOAA News': '#003366',
-                    'Earthquake Alert': '#8B0000'
-                }
-                
-                color = source_colors.get(news['source'], '#666666')
-                
-                st.markdown(f"""
-                <div style="
-                    border-left: 5px solid {color}; 
-                    padding: 15px; 
-                    margin: 10px 0; 
-                    background-color: rgba(255, 255, 255, 0.05);
-                    border-radius: 5px;
-                ">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                        <span style="background-color: {color}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px; font-weight: bold;">
-                            {news['source']}
-                        </span>
-                        <small style="color: #888;">{news['published']}</small>
-                    </div>
-                    <h4 style="margin: 8px 0; color: {color};">
-                        <a href="{news['link']}" target="_blank" style="text-decoration: none; color: inherit;">
-                            {news['title']}
-                        </a>
-                    </h4>
-                    <p style="margin: 8px 0; line-height: 1.5; color: #ddd;">
-                        {news['summary']}
-                    </p>
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 10px;">
-                        <span style="background-color: rgba({color[1:3]}, {color[3:5]}, {color[5:7]}, 0.2); 
-                                     color: {color}; padding: 2px 6px; border-radius: 8px; font-size: 11px;">
-                            Relevance: {news['relevance_score']}
-                        </span>
-                        <a href="{news['link']}" target="_blank" style="
-                            background-color: {color}; 
-                            color: white; 
-                            padding: 5px 12px; 
-                            border: none; 
-                            border-radius: 15px; 
-                            text-decoration: none; 
-                            font-size: 12px;
-                            font-weight: bold;
-                        ">
-                            Read Full Article →
-                        </a>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Add separator
-                if i < len(filtered_news) - 1:
-                    st.markdown("<hr style='margin: 20px 0; opacity: 0.3;'>", unsafe_allow_html=True)
+        # Display news in cards, emitted as a single markdown block
+        news_cards = [
+            render_news_card(news['source'], news['title'], news['summary'], news['link'],
+                             news['published'], news['relevance_score'],
+                             SOURCE_COLORS.get(news['source'], '#666666'),
+                             SOURCE_RGB.get(news['source'], (102, 102, 102)))
+            for news in filtered_news
+        ]
+        st.markdown("\n<hr style='margin: 20px 0; opacity: 0.3;'>\n".join(news_cards), unsafe_allow_html=True)
         
         # News summary statistics
         st.markdown("---")
@@ -843,15 +1056,15 @@ with tab2:
         with col1:
             st.metric("📰 Total Articles", len(st.session_state.news_data))
         with col2:
-            sources_count = len(set([news['source'] for news in st.session_state.news_data]))
-            st.metric("📡 Active Sources", sources_count)
+            st.metric("📡 Active Sources", len(st.session_state.news_source_names))
         with col3:
-            high_relevance = len([news for news in st.session_state.news_data if news['relevance_score'] > 5])
+            # Scores are sorted descending, so articles scoring above 5 form a prefix
+            high_relevance = int(np.searchsorted(-st.session_state.news_relevance, -5, side='left'))
             st.metric("🔥 High Priority", high_relevance)
         with col4:
-            recent_count = len([news for news in st.session_state.news_data 
-                              if news['published_parsed'] and 
-                              datetime(*news['published_parsed'][:6]) > datetime.now() - timedelta(hours=6)])
+            six_hours_ago = now - timedelta(hours=6)
+            recent_count = sum(1 for news in st.session_state.news_data
+                               if news['published_dt'] and news['published_dt'] > six_hours_ago)
             st.metric("⏰ Last 6 Hours", recent_count)
             
     else:
@@ -878,9 +1091,7 @@ with tab3:
     st.subheader("📊 Seismic Activity Analytics")
     
     if not st.session_state.earthquake_data.empty:
-        recent_data = st.session_state.earthquake_data[
-            st.session_state.earthquake_data['time'] >= datetime.now() - timedelta(days=7)
-        ]
+        recent_data = st.session_state.earthquake_windows["Last 7 days"]
         
         if not recent_data.empty:
             col1, col2 = st.columns(2)
@@ -894,13 +1105,17 @@ with tab3:
                     (clean_data['magnitude'] <= 10)  # Remove outliers
                 ]
                 
+                # Column arrays shared by every chart below
+                magnitudes = clean_data['magnitude'].to_numpy()
+                depths = clean_data['depth'].to_numpy()
+                
                 if not clean_data.empty:
                     # Magnitude distribution
                     fig_mag = px.histogram(
-                        clean_data, 
-                        x='magnitude', 
+                        x=magnitudes, 
                         nbins=20,
                         title="Magnitude Distribution (Last 7 Days)",
+                        labels={'x': 'magnitude'},
                         color_discrete_sequence=['#1f77b4']
                     )
                     fig_mag.update_layout(height=400)
@@ -908,17 +1123,18 @@ with tab3:
                     
                     # Depth vs Magnitude scatter
                     # Ensure size values are positive and reasonable
-                    clean_data['size_val'] = np.maximum(clean_data['magnitude'], 0.1) * 3  # Scale for visibility
+                    size_val = np.maximum(magnitudes, 0.1) * 3  # Scale for visibility
                     
                     fig_scatter = px.scatter(
-                        clean_data,
-                        x='depth',
-                        y='magnitude',
-                        color='magnitude',
-                        size='size_val',
+                        x=depths,
+                        y=magnitudes,
+                        color=magnitudes,
+                        size=size_val,
                         title="Depth vs Magnitude",
-                        hover_data=['place', 'time'],
-                        size_max=20
+                        labels={'x': 'depth', 'y': 'magnitude', 'color': 'magnitude', 'size': 'size_val'},
+                        hover_data={'place': clean_data['place'].to_numpy(), 'time': clean_data['time'].to_numpy()},
+                        size_max=20,
+                        render_mode='webgl'  # One GPU draw call instead of an SVG node per point
                     )
                     fig_scatter.update_layout(height=400)
                     st.plotly_chart(fig_scatter, use_container_width=True)
@@ -928,8 +1144,14 @@ with tab3:
             with col2:
                 if not clean_data.empty:
                     # Time series
-                    daily_counts = clean_data.groupby(clean_data['time'].dt.date).size().reset_index()
-                    daily_counts.columns = ['date', 'count']
+                    # Integer day numbers histogrammed with bincount; days without events count as 0
+                    days = clean_data['time'].to_numpy().astype('datetime64[D]').astype('i8')
+                    first_day = days.min()
+                    counts = np.bincount(days - first_day)
+                    daily_counts = pd.DataFrame({
+                        'date': pd.to_datetime(first_day + np.arange(len(counts)), unit='D'),
+                        'count': counts
+                    })
                     
                     fig_time = px.line(
                         daily_counts,
@@ -942,15 +1164,16 @@ with tab3:
                     st.plotly_chart(fig_time, use_container_width=True)
                     
                     # Alert level distribution - only for valid data
-                    clean_data['alert_level'] = clean_data.apply(
-                        lambda x: calculate_tsunami_threat(x['magnitude'], x['depth']), axis=1
+                    # Histogram the integer codes in fixed severity order, dropping empty levels
+                    alert_counts = np.bincount(
+                        calculate_tsunami_threat_codes(magnitudes, depths), minlength=len(THREAT_LEVELS)
                     )
-                    
-                    alert_counts = clean_data['alert_level'].value_counts()
-                    if not alert_counts.empty:
+                    present = alert_counts > 0
+                    alert_names, alert_counts = THREAT_LEVELS[present], alert_counts[present]
+                    if alert_counts.size:
                         fig_alerts = px.pie(
-                            values=alert_counts.values,
-                            names=alert_counts.index,
+                            values=alert_counts,
+                            names=alert_names,
                             title="Tsunami Threat Levels"
                         )
                         fig_alerts.update_layout(height=400)
@@ -979,14 +1202,16 @@ with tab4:
     
     if st.button("🚀 Run Simulation", type="primary"):
         with st.spinner("Running tsunami propagation simulation..."):
-            simulation_data = simulate_wave_propagation(sim_lat, sim_lon, sim_magnitude, hours_to_simulate)
+            simulation = simulate_wave_propagation(sim_lat, sim_lon, sim_magnitude, hours_to_simulate)
+            all_wave_heights = np.concatenate([hour_data['wave_height'] for hour_data in simulation.values()])
             
-            if not simulation_data.empty:
+            if all_wave_heights.size:
+                max_wave = all_wave_heights.max()
+                
                 # Create animation frames
                 frames = []
-                for hour in range(hours_to_simulate + 1):
-                    hour_data = simulation_data[simulation_data['hour'] == hour]
-                    if not hour_data.empty:
+                for hour, hour_data in simulation.items():
+                    if hour_data['wave_height'].size:
                         frame = go.Scattergeo(
                             lon=hour_data['longitude'],
                             lat=hour_data['latitude'],
@@ -996,11 +1221,11 @@ with tab4:
                                 color=hour_data['wave_height'],
                                 colorscale='Blues',
                                 cmin=0,
-                                cmax=simulation_data['wave_height'].max(),
+                                cmax=max_wave,
                                 showscale=True,
                                 colorbar=dict(title="Wave Height (m)")
                             ),
-                            text=hour_data['wave_height'].round(2),
+                            text=np.round(hour_data['wave_height'], 2),
                             hovertemplate='<b>Wave Height:</b> %{text} m<br>' +
                                         '<b>Lat:</b> %{lat}<br>' +
                                         '<b>Lon:</b> %{lon}<extra></extra>',
@@ -1022,9 +1247,22 @@ with tab4:
                                 f'<b>Location:</b> ({sim_lat}, {sim_lon})<extra></extra>'
                 ))
                 
-                # Add initial frame
+                # Add initial frame and wire every hour into the animation (trace 1 is the wave layer)
                 if frames:
                     fig.add_trace(frames[0])
+                    fig.frames = [go.Frame(data=[frame], traces=[1], name=frame.name) for frame in frames]
+                    fig.update_layout(
+                        updatemenus=[dict(
+                            type='buttons',
+                            showactive=False,
+                            buttons=[
+                                dict(label='Play', method='animate',
+                                     args=[None, dict(frame=dict(duration=500, redraw=True), fromcurrent=True)]),
+                                dict(label='Pause', method='animate',
+                                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')])
+                            ]
+                        )]
+                    )
                 
                 fig.update_layout(
                     title=f"Tsunami Wave Propagation Simulation (M{sim_magnitude})",
@@ -1042,8 +1280,7 @@ with tab4:
                 
                 # Show simulation summary
                 st.subheader("📊 Simulation Summary")
-                max_wave = simulation_data['wave_height'].max()
-                affected_area = len(simulation_data[simulation_data['wave_height'] > 0.5])
+                affected_area = int((all_wave_heights > 0.5).sum())
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -1059,29 +1296,37 @@ with tab5:
     st.subheader("📋 Recent Earthquake Events")
     
     if not st.session_state.earthquake_data.empty:
-        # Filter and sort recent events
-        recent_events = st.session_state.earthquake_data[
-            st.session_state.earthquake_data['time'] >= datetime.now() - timedelta(hours=48)
-        ].sort_values('time', ascending=False)
+        # The window is a prefix slice of the time-descending frame, so it is already sorted
+        recent_events = st.session_state.earthquake_windows["Last 48 hours"]
         
         if not recent_events.empty:
-            # Add tsunami risk assessment
-            recent_events['tsunami_risk'] = recent_events.apply(
-                lambda x: 'HIGH' if x['magnitude'] >= tsunami_threshold and x['depth'] <= depth_threshold
-                else 'MEDIUM' if x['magnitude'] >= 6.5 and x['depth'] <= depth_threshold
-                else 'LOW', axis=1
+            # Display table
+            display_columns = ['time', 'magnitude', 'depth', 'place']
+            export_df = recent_events[display_columns].set_axis(
+                ['Time (UTC)', 'Magnitude', 'Depth (km)', 'Location'], axis=1
             )
             
-            # Display table
-            display_columns = ['time', 'magnitude', 'depth', 'place', 'tsunami_risk']
-            display_df = recent_events[display_columns].copy()
-            display_df['time'] = display_df['time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            display_df.columns = ['Time (UTC)', 'Magnitude', 'Depth (km)', 'Location', 'Tsunami Risk']
+            # Add tsunami risk assessment on the copy rather than the cached window
+            event_magnitudes = export_df['Magnitude'].to_numpy()
+            event_depths = export_df['Depth (km)'].to_numpy()
+            export_df['Tsunami Risk'] = np.select(
+                [
+                    (event_magnitudes >= tsunami_threshold) & (event_depths <= depth_threshold),
+                    (event_magnitudes >= 6.5) & (event_depths <= depth_threshold)
+                ],
+                ['HIGH', 'MEDIUM'],
+                default='LOW'
+            )
+            # Only the on-screen copy gets string times; the export formats them while writing the CSV
+            display_df = export_df.copy()
+            display_df['Time (UTC)'] = display_df['Time (UTC)'].dt.strftime('%Y-%m-%d %H:%M:%S')
             
             st.dataframe(
                 display_df,
                 use_container_width=True,
                 column_config={
+                    "Magnitude": st.column_config.NumberColumn("Magnitude", format="%.2f"),
+                    "Depth (km)": st.column_config.NumberColumn("Depth (km)", format="%.1f"),
                     "Tsunami Risk": st.column_config.TextColumn(
                         "Tsunami Risk",
                         help="Risk assessment based on magnitude and depth"
@@ -1090,11 +1335,11 @@ with tab5:
             )
             
             # Export options
-            csv = display_df.to_csv(index=False)
+            csv = dataframe_to_csv(dataframe_fingerprint(export_df), export_df)
             st.download_button(
                 label="📥 Download as CSV",
                 data=csv,
-                file_name=f"earthquake_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                file_name=f"earthquake_data_{now.strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv"
             )
         else:
@@ -1121,8 +1366,9 @@ with col4:
     st.write(f"📰 News Articles: {news_count}")
 
 # Auto-refresh functionality - only refresh based on time interval, not map clicks
-if auto_refresh and (datetime.now() - st.session_state.last_update).seconds > refresh_interval:
-    # Only rerun if 60 seconds have passed since last update
-    if (datetime.now() - st.session_state.last_update).seconds >= 60:
-        st.session_state.last_update = datetime.now()
-        st.rerun()
\ No newline at end of file
+# (and never more often than every 60 seconds)
+current_mono = time.monotonic()
+if auto_refresh and current_mono - st.session_state.last_update_mono > max(refresh_interval, 60):
+    st.session_state.last_update_mono = current_mono
+    st.session_state.last_update = datetime.now()
+    st.rerun()
\ No newline at end of file